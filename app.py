@@ -1,9 +1,40 @@
 import streamlit as st
 import os
-import pandas as pd
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from utils.jobs_matcher import JobMatcher
-from utils.pdf_handler import extract_text_from_pdf
-from utils.groq_analyzer import analyze_resume
+from utils.pdf_handler import extract_text_from_pdf, READ_ERROR_PREFIX
+from utils.groq_analyzer import analyze_resume_with_usage
+
+# ---- Logging (e.g. TALENTMATCH_LOG=DEBUG) ----
+logging.basicConfig(format="%(asctime)s %(name)s %(levelname)s: %(message)s")
+log_level = os.getenv("TALENTMATCH_LOG", "WARNING").upper()
+# getLevelName returns the numeric level for known names (and a string otherwise)
+if not isinstance(logging.getLevelName(log_level), int):
+    logging.getLogger(__name__).warning("Unknown TALENTMATCH_LOG level %r, using WARNING", log_level)
+    log_level = "WARNING"
+logging.getLogger("utils").setLevel(log_level)
+
+
+# ---- Cached Helpers ----
+@st.cache_data(show_spinner=False)
+def get_resume_analysis(resume_text: str, _usage: dict) -> dict:
+    # _usage is left out of the cache key and only filled when Groq is actually
+    # called, so cache hits don't report the original call's tokens again
+    resume_data, usage = analyze_resume_with_usage(resume_text)
+    if resume_data is None:
+        # Raise instead of returning None so failed analyses aren't cached
+        raise ValueError("Resume analysis failed")
+    _usage.update(usage)
+    return resume_data
+
+
+@st.cache_resource(show_spinner=False)
+def get_job_matcher(csv_path: str, n_jobs: int = -1) -> JobMatcher:
+    # One matcher per process: the jobs data and its derived columns are built once
+    return JobMatcher(csv_path, n_jobs=n_jobs)
+
 
 # ---- Basic Streamlit Page Setup ----
 st.set_page_config(page_title="TalentMatch AI", page_icon="🎯", layout="centered")
@@ -25,16 +56,26 @@ if uploaded_file is not None:
             with st.spinner("🤖 Reading your resume and searching jobs..."):
                 # Step 1: Extract resume text
                 resume_text = extract_text_from_pdf(uploaded_file)
-
-                # Step 2: Analyze resume (Groq Analyzer)
-                resume_data = analyze_resume(resume_text)
-                if resume_data is None:
-                    st.error("❌ Resume analysis failed. Please try again.")
+                if resume_text.startswith(READ_ERROR_PREFIX) or not resume_text.strip():
+                    st.error(f"❌ {resume_text or 'No text found in the PDF.'}")
                     st.stop()
 
-                # Step 3: Initialize JobMatcher
+                # Step 2 & 3: Analyze resume (Groq Analyzer) while the JobMatcher loads.
+                # Worker threads get the script context so Streamlit's caches work there.
                 csv_path = os.path.join("data", "tech_jobs_data.csv")
-                matcher = JobMatcher(csv_path)
+                with ThreadPoolExecutor(max_workers=2, initializer=add_script_run_ctx,
+                                        initargs=(None, get_script_run_ctx())) as executor:
+                    matcher_future = executor.submit(get_job_matcher, csv_path)
+                    usage = {}
+                    analysis_future = executor.submit(get_resume_analysis, resume_text, usage)
+                    try:
+                        resume_data = analysis_future.result()
+                    except ValueError:
+                        resume_data = None
+                    if resume_data is None:
+                        st.error("❌ Resume analysis failed. Please try again.")
+                        st.stop()
+                    matcher = matcher_future.result()
 
                 # Step 4: Find matches
                 matches = matcher.finding_matching_jobs(
@@ -43,6 +84,10 @@ if uploaded_file is not None:
                     # min_score=min_score
                 )
 
+            if usage:
+                st.caption(f"🧮 Groq tokens: {usage['prompt_tokens']} prompt "
+                           f"({usage['cached_tokens']} cached), {usage['completion_tokens']} completion")
+
             # ---- Display Results ----
             if len(matches) > 0:
                 st.success(f"✅ Found {len(matches)} matching jobs!")
@@ -52,7 +97,7 @@ if uploaded_file is not None:
                     st.markdown(f"**{i}. {job['title']}**  —  {job['company']}")
                     st.caption(f"📍 {job['location']} | 📊 Level: {job['experience_level']} | 🎯 Match: {job['match_score']*100:.0f}%")
 
-                    if pd.notna(job.get('post_link')):
+                    if job.get('post_link'):
                         st.link_button("🔗 Apply Now", job['post_link'])
 
                     # Optional description preview
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Make the `utils` package importable when running pytest from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# groq_analyzer builds its client at import time; tests replace it with a fake
+os.environ.setdefault("GROQ_API_KEY", "test-key")
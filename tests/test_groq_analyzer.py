@@ -0,0 +1,108 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from utils import groq_analyzer
+
+
+class FakeCompletions:
+    """Stand-in for client.chat.completions that replays canned replies."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        message = SimpleNamespace(content=self.replies.pop(0))
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=20, prompt_tokens_details=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage, x_groq=None)
+
+
+@pytest.fixture
+def completions(monkeypatch, tmp_path):
+    """Route Groq calls to a FakeCompletions and the analysis cache to a temp dir."""
+    fake = FakeCompletions([])
+    monkeypatch.setattr(groq_analyzer, "client", SimpleNamespace(chat=SimpleNamespace(completions=fake)))
+    monkeypatch.setattr(groq_analyzer, "_DISK", tmp_path / "analyses.sqlite")
+    monkeypatch.setattr(groq_analyzer, "_MEM_CACHE", {})
+    return fake
+
+
+def analysis(skill):
+    return {"skills": [skill], "experience_years": 2, "past_roles": ["Developer"]}
+
+
+def test_system_prompt_does_not_fix_the_output_shape():
+    assert "Start with" not in groq_analyzer.SYSTEM_PROMPT
+
+
+def test_analyze_resume_returns_usage_and_caches(completions):
+    completions.replies = [json.dumps(analysis("python"))]
+
+    result, usage = groq_analyzer.analyze_resume_with_usage("Python developer since 2020")
+    assert result["skills"] == ["python"]
+    assert usage == {"prompt_tokens": 100, "completion_tokens": 20, "cached_tokens": 0}
+    assert completions.calls[0]["messages"][1]["content"].startswith(groq_analyzer.SINGLE_OUTPUT_INSTRUCTION)
+
+    cached, usage = groq_analyzer.analyze_resume_with_usage("Python developer since 2020")
+    assert cached == result
+    assert usage == {}
+    assert len(completions.calls) == 1
+
+
+def test_unreadable_pdf_is_not_analyzed(completions):
+    assert groq_analyzer.analyze_resume("Error reading file. An error occured: bad PDF") is None
+    assert groq_analyzer.analyze_resume("   ") is None
+    assert completions.calls == []
+
+
+def test_resume_without_breaks_is_still_sent(completions):
+    completions.replies = [json.dumps(analysis("python"))]
+    groq_analyzer.analyze_resume("word " * 1000)
+    assert completions.calls[0]["messages"][1]["content"].endswith("word")
+
+
+def test_batch_asks_for_an_array_in_one_request(completions):
+    completions.replies = [json.dumps([analysis("python"), analysis("java")])]
+
+    results, usage = groq_analyzer.analyze_resumes_batch(["Python resume", "Java resume"])
+    assert [result["skills"] for result in results] == [["python"], ["java"]]
+    assert usage["prompt_tokens"] == 100
+    assert len(completions.calls) == 1
+    assert completions.calls[0]["messages"][1]["content"].startswith(groq_analyzer.BATCH_OUTPUT_INSTRUCTION)
+
+    # Both analyses were cached, so a repeat makes no request
+    results, usage = groq_analyzer.analyze_resumes_batch(["Python resume", "Java resume"])
+    assert [result["skills"] for result in results] == [["python"], ["java"]]
+    assert usage == {}
+    assert len(completions.calls) == 1
+
+
+def test_batch_falls_back_to_single_calls_and_sums_usage(completions):
+    completions.replies = [
+        json.dumps(analysis("python")),  # an object instead of the requested array
+        json.dumps(analysis("python")),
+        json.dumps(analysis("java")),
+    ]
+
+    results, usage = groq_analyzer.analyze_resumes_batch(["Python resume", "Java resume"])
+    assert [result["skills"] for result in results] == [["python"], ["java"]]
+    assert len(completions.calls) == 3
+    assert usage == {"prompt_tokens": 300, "completion_tokens": 60, "cached_tokens": 0}
+
+
+def test_resume_text_is_prepared_once_per_call(completions, monkeypatch):
+    prepared = []
+    prepare = groq_analyzer._prepare_resume_text
+    monkeypatch.setattr(groq_analyzer, "_prepare_resume_text",
+                        lambda text: prepared.append(text) or prepare(text))
+    completions.replies = [json.dumps(analysis("python")), json.dumps([analysis("java"), analysis("go")])]
+
+    groq_analyzer.analyze_resume("Python resume")
+    groq_analyzer.analyze_resume("Python resume")
+    assert len(prepared) == 2  # one miss, one hit
+
+    groq_analyzer.analyze_resumes_batch(["Java resume", "Go resume"])
+    assert len(prepared) == 4
@@ -0,0 +1,187 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import jobs_matcher
+from utils.jobs_matcher import JobMatcher
+
+FILLER = ("team product customers platform growth remote office culture benefits "
+          "mission values collaborate build deliver quality ownership")
+# Posting boilerplate shared by a couple of jobs; dilutes their skill cosine
+DUTIES = " ".join(f"duty{i}" for i in range(60))
+
+
+def make_jobs(rows):
+    """Jobs DataFrame in the CSV's column layout from (category, description, keywords) rows."""
+    return pd.DataFrame({
+        'company': [f"Company {i}" for i in range(len(rows))],
+        'category': [category for category, _, _ in rows],
+        'post_link': [f"https://example.com/{i}" for i in range(len(rows))],
+        'job_description': [description for _, description, _ in rows],
+        'location': ["Remote"] * len(rows),
+        'date_posted': ["2024-01-01"] * len(rows),
+        'keywords': [keywords for _, _, keywords in rows],
+    })
+
+
+def test_skill_relevant_job_outranks_title_only_match():
+    matcher = JobMatcher(make_jobs([
+        ("Platform", f"Python SQL AWS pipelines. {DUTIES} {FILLER}", ""),
+        ("Data Engineer", f"Data Engineer role. {FILLER}", ""),
+        ("Support", f"Customer support. {DUTIES} {FILLER}", ""),
+        ("Sales", f"Account sales. {FILLER}", ""),
+        ("Design", f"Visual design with python. {FILLER}", ""),
+        ("Finance", f"Budget planning with sql and aws. {FILLER}", ""),
+    ]))
+    resume = {'skills': ['Python', 'SQL', 'AWS'], 'experience_years': 4,
+              'desired_roles': ['Data Engineer']}
+
+    matches = matcher.finding_matching_jobs(resume, top_n=6, min_score=0)
+    titles = list(matches['title'])
+    # Raw cosine (about 0.2 here) would leave the skills too little weight to
+    # beat the title match
+    assert titles.index("Platform") < titles.index("Data Engineer")
+    assert ((matches['skill_score'] >= 0) & (matches['skill_score'] <= 1)).all()
+
+
+
+def test_parallel_skill_scan_matches_in_process_scan(monkeypatch):
+    rows = [("Engineer", f"python sql aws docker job {i}", "python, sql") for i in range(40)]
+    rows += [("Analyst", f"excel tableau sql report {i}", "excel") for i in range(41)]
+    skills = ['python', 'sql', 'sql', 'c++', 'tableau']
+    expected = JobMatcher(make_jobs(rows), n_jobs=1)._scan_skill_hits(skills)
+
+    worker_counts = []
+    parallel = jobs_matcher.Parallel
+
+    def recording_parallel(n_jobs, **kwargs):
+        worker_counts.append(n_jobs)
+        return parallel(n_jobs=n_jobs, **kwargs)
+
+    monkeypatch.setattr(jobs_matcher, "Parallel", recording_parallel)
+    monkeypatch.setattr(jobs_matcher, "PARALLEL_MIN_ROWS", 50)
+    chunked = JobMatcher(make_jobs(rows), n_jobs=3)._scan_skill_hits(skills)
+
+    assert worker_counts == [3]
+    assert chunked.tolist() == expected.tolist()
+
+    # Below PARALLEL_MIN_ROWS the scan stays in-process
+    JobMatcher(make_jobs(rows[:49]), n_jobs=3)._scan_skill_hits(skills)
+    assert worker_counts == [3]
+
+
+def old_experience_match(resume_years, job_level):
+    """The per-job if/elif ladder calculate_experience_match replaced."""
+    level_ranges = {
+        'Internship': (0, 1), 'Entry level': (0, 2), 'Associate': (1, 3),
+        'Mid-Senior level': (3, 8), 'Director': (8, 15), 'Executive': (15, 30)
+    }
+    if job_level not in level_ranges:
+        return 0.5
+    min_years, max_years = level_ranges[job_level]
+    if min_years <= resume_years <= max_years:
+        return 1.0
+    elif resume_years < min_years:
+        gap = min_years - resume_years
+        for limit, score in [(0.5, 0.95), (1.0, 0.85), (1.5, 0.70), (2.0, 0.55)]:
+            if gap <= limit:
+                return score
+        return 0.30
+    else:
+        gap = resume_years - max_years
+        for limit, score in [(1.0, 0.90), (2.0, 0.75), (3.0, 0.60)]:
+            if gap <= limit:
+                return score
+        return 0.40
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return JobMatcher(make_jobs([
+        ("Data Engineer", "Senior Data Engineer\nBuild pipelines in python.", "python, sql"),
+        ("", "Junior Analyst\nReports in excel.", "excel"),
+        ("", "", ""),
+    ]))
+
+
+LEVELS = ['Internship', 'Entry level', 'Associate', 'Mid-Senior level',
+          'Director', 'Executive', 'Unknown', '']
+
+
+def test_experience_match_equals_old_ladder(matcher):
+    years = [y / 4 for y in range(0, 141)] + [-1.0, math.nan]
+    for level in LEVELS:
+        expected = [old_experience_match(y, level) for y in years]
+        assert [matcher.calculate_experience_match(y, level) for y in years] == expected
+        assert matcher.calculate_experience_match(np.array(years), level).tolist() == expected
+
+
+def test_experience_match_broadcasts_over_levels(matcher):
+    scores = matcher.calculate_experience_match(4.0, np.array(LEVELS))
+    assert scores.tolist() == [old_experience_match(4.0, level) for level in LEVELS]
+
+
+def test_experience_levels_follow_pattern_priority_and_word_boundaries():
+    matcher = JobMatcher(make_jobs([
+        ("Engineering", "Senior engineer or intern, either works", ""),
+        ("Engineering", "Junior engineer reporting to the director", ""),
+        ("Engineering", "Engineer for our international and internal tools", ""),
+        ("Engineering", "Leadership skills and senior-ish experience", ""),
+        ("Engineering", "Sr. engineer", ""),
+        ("Engineering", "Head of engineering", ""),
+        ("Engineering", "Reports to the CTO", ""),
+        ("Engineering", "Plain engineer", ""),
+    ]))
+    assert list(matcher._levels) == [
+        'Internship',        # intern beats senior
+        'Entry level',       # junior beats director
+        'Mid-Senior level',  # "international"/"internal" are not internships
+        'Mid-Senior level',  # "senior-ish" is senior, "leadership" is not "lead"
+        'Mid-Senior level',
+        'Director',
+        'Executive',
+        'Mid-Senior level',  # default
+    ]
+    for i, row in matcher.jobs_df.iterrows():
+        assert matcher.estimate_experience_level(row['job_description'], row['category']) == matcher._levels[i]
+
+
+def test_titles_fall_back_to_first_description_line(matcher):
+    assert list(matcher._titles) == ["Data Engineer", "Junior Analyst", "Unknown Position"]
+    assert matcher.extract_title_from_description("Junior Analyst\nReports in excel.") == "Junior Analyst"
+    assert matcher.extract_title_from_description("") == "Unknown Position"
+
+
+def test_skill_matrix_counts_equal_text_scan():
+    common = ["python", "sql", "aws", "docker"]
+    rows = [
+        ("Engineer", f"{' '.join(common[:i % 4 + 1])} and c++ work {i}", ", ".join(common[:i % 4 + 1]))
+        for i in range(24)
+    ]
+    matcher = JobMatcher(make_jobs(rows))
+    skills = ["Python", "SQL", "sql", "c++", "Rust", "docker"]
+
+    counts = matcher._count_skill_hits(skills)
+    vocab, skill_matrix = matcher._skill_index
+    assert skill_matrix is not None and {"python", "sql", "docker"} <= set(vocab)
+    assert counts.tolist() == matcher._scan_skill_hits([skill.lower() for skill in skills]).tolist()
+
+
+def test_top_matches_are_sorted_with_ties_in_csv_order():
+    rows = [("Engineer", f"python job {i}", "") for i in range(6)]
+    rows += [("Engineer", f"python sql aws job {i}", "") for i in range(6)]
+    matcher = JobMatcher(make_jobs(rows))
+    resume = {'skills': ['Python', 'SQL', 'AWS'], 'experience_years': 4}
+
+    matches = matcher.finding_matching_jobs(resume, top_n=8, min_score=0)
+    assert len(matches) == 8
+    assert matches['match_score'].is_monotonic_decreasing
+    # The six equal-scoring python/sql/aws jobs come first, in CSV order
+    assert list(matches['company'][:6]) == [f"Company {i}" for i in range(6, 12)]
+    assert list(matches['company'][6:]) == ["Company 0", "Company 1"]
+
+    everything = matcher.finding_matching_jobs(resume, top_n=100, min_score=0)
+    assert len(everything) == len(rows)
+    assert matcher.finding_matching_jobs(resume, top_n=8, min_score=1.01).empty
@@ -0,0 +1,34 @@
+from utils.prompt_compress import compress_resume
+
+
+def test_short_text_is_unchanged():
+    text = "Python developer with 3 years of experience."
+    assert compress_resume(text) == text
+
+
+def test_compressed_text_fits_budget():
+    text = "\n".join(f"Built data pipeline {i} in Python and SQL." for i in range(200))
+    compressed = compress_resume(text, budget_chars=500)
+    assert 0 < len(compressed) <= 500
+    assert compressed.splitlines()[0] in text
+
+
+def test_text_without_breaks_is_cut_not_dropped():
+    text = "word " * 1000
+    compressed = compress_resume(text)
+    assert compressed
+    assert len(compressed) <= 2500
+    assert text.startswith(compressed)
+
+
+def test_oversized_sentences_are_cut_to_budget():
+    text = "\n".join(["python " * 100, "sql " * 200])
+    compressed = compress_resume(text, budget_chars=300)
+    assert compressed
+    assert len(compressed) <= 300
+
+
+def test_repeated_lines_are_kept_once():
+    header = "Jane Doe - Resume"
+    body = "\n".join(f"{header}\nLed project {i} using Docker and AWS." for i in range(100))
+    assert compress_resume(body, budget_chars=1000).count(header) <= 1
@@ -1,55 +1,37 @@
 import os
 import json
+import logging
+import copy
+import contextlib
+import hashlib
+import pathlib
+import sqlite3
 # import google.generativeai as genai
 from groq import Groq
+from typing import List
 from dotenv import load_dotenv
+from utils.prompt_compress import compress_resume
+from utils.pdf_handler import READ_ERROR_PREFIX
+
+logger = logging.getLogger(__name__)
 
 load_dotenv()
 groq_api_key = os.getenv("GROQ_API_KEY")
 client = Groq(api_key=groq_api_key)
 
-def analyze_resume(resume_text: str) -> dict:
-    """
-    Analyze resume and extract information for job matching.
-    
-    Returns:
-        dict: Job-matching relevant data or None if extraction fails
-    """
-    
-    # ============================================
-    # STEP 1: Truncate Input
-    # ============================================
-    print(f"Original resume: {len(resume_text)} chars")
-    max_char = 4000
-    
-    if len(resume_text) <= max_char:
-        prepared_text = resume_text
-    else:
-        truncated = resume_text[:max_char]
-        last_spaced_index = truncated.rfind(' ')
-        if last_spaced_index > 0:
-            prepared_text = truncated[:last_spaced_index]
-        else:
-            prepared_text = truncated
-        print(f"Truncated from {len(resume_text)} to {len(prepared_text)} chars")
-    
-    resume_text = prepared_text
-    print(f"After truncation: {len(resume_text)} chars")
+MODEL = "llama-3.1-8b-instant"
 
-    # ============================================
-    # STEP 2: Build Prompt
-    # ============================================
-    system_message = """You are an expert resume parser specializing in extracting job-matching information.
+# Static instructions sent as the system message. Keeping every
+# resume-independent byte here gives each request the same prompt prefix,
+# which Groq can serve from its prompt cache.
+SYSTEM_PROMPT = """You are an expert resume parser specializing in extracting job-matching information.
 Your task is to analyze resumes and extract data useful for matching candidates with job opportunities.
-Always return valid JSON only, with no extra text."""
-
-    user_prompt = f"""Analyze this resume and extract information relevant for job matching.
+Always return valid JSON only, with no extra text.
 
-RESUME TEXT:
-{resume_text}
+Analyze the resume(s) in the user message and extract information relevant for job matching.
 
-Return ONLY a valid JSON object (no markdown, no code blocks) with these exact fields:
-{{
+Each resume analysis is a JSON object (no markdown, no code blocks) with these exact fields:
+{
     "skills": ["skill1", "skill2"],
     "experience_years": 2.5,
     "past_roles": ["role1", "role2"],
@@ -62,7 +44,7 @@ Return ONLY a valid JSON object (no markdown, no code blocks) with these exact f
     "work_preferences": "Remote/Hybrid/Onsite/Flexible",
     "key_achievements": ["achievement1"],
     "desired_roles": ["role1", "role2"]
-}}
+}
 
 EXTRACTION INSTRUCTIONS:
 1. skills: Extract ALL technical and soft skills (minimum 5)
@@ -82,10 +64,245 @@ DEFAULTS for missing data:
 - Lists: []
 - Numbers: 0
 - Strings: "Not specified"
-
-Return ONLY the JSON object. Start with {{ and end with }}.
 """
 
+# Output shape instructions sit at the start of the user message (not in
+# SYSTEM_PROMPT), so single and batched requests can ask for different shapes
+SINGLE_OUTPUT_INSTRUCTION = "Return ONLY the JSON object for this resume. Start with { and end with }."
+BATCH_OUTPUT_INSTRUCTION = ("Return ONLY a JSON array with one object per resume below, "
+                            "in the same order. Start with [ and end with ].")
+
+# Analysis cache keyed by resume content hash: in-process dict backed by SQLite
+_MEM_CACHE: dict = {}
+_DISK = pathlib.Path(".cache/resume_analysis.sqlite")
+
+
+def _usage_from(response) -> dict:
+    """Prompt/completion token counts of a response, including prompt-cache hits."""
+    usage = getattr(response, 'usage', None)
+    if usage is None:
+        return {}
+    
+    cached_tokens = 0
+    x_groq_usage = getattr(getattr(response, 'x_groq', None), 'usage', None)
+    if x_groq_usage is not None:
+        cached_tokens = getattr(x_groq_usage, 'cached_tokens', 0) or 0
+    details = getattr(usage, 'prompt_tokens_details', None)
+    if not cached_tokens and details is not None:
+        cached_tokens = getattr(details, 'cached_tokens', 0) or 0
+    
+    logger.info("Tokens: %d prompt (%d cached), %d completion",
+                usage.prompt_tokens, cached_tokens, usage.completion_tokens)
+    return {
+        'prompt_tokens': usage.prompt_tokens,
+        'completion_tokens': usage.completion_tokens,
+        'cached_tokens': cached_tokens
+    }
+
+
+def _add_usage(total: dict, usage: dict) -> None:
+    """Accumulate token counts from several calls into `total`."""
+    for name, count in usage.items():
+        total[name] = total.get(name, 0) + count
+
+
+def _cache_key(prepared_text: str) -> str:
+    """
+    Hash everything that determines an analysis: the model, the system
+    prompt and the compressed/truncated text actually sent (as returned by
+    _prepare_resume_text). Changing any of them (including the compression
+    settings) starts a fresh cache entry.
+    """
+    key = hashlib.blake2b(digest_size=16)
+    parts = (MODEL, SYSTEM_PROMPT, SINGLE_OUTPUT_INSTRUCTION, prepared_text.strip())
+    for part in parts:
+        key.update(part.encode())
+        key.update(b'\0')
+    return key.hexdigest()
+
+
+def _has_resume_text(resume_text: str) -> bool:
+    """False for empty text or the error message returned for unreadable PDFs."""
+    return bool(resume_text.strip()) and not resume_text.startswith(READ_ERROR_PREFIX)
+
+
+def _disk_connect() -> sqlite3.Connection:
+    _DISK.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(_DISK)
+    conn.execute("CREATE TABLE IF NOT EXISTS analyses (hash TEXT PRIMARY KEY, json TEXT)")
+    return conn
+
+
+def _cache_get(key: str):
+    if key in _MEM_CACHE:
+        return copy.deepcopy(_MEM_CACHE[key])
+    try:
+        with contextlib.closing(_disk_connect()) as conn:
+            row = conn.execute("SELECT json FROM analyses WHERE hash = ?", (key,)).fetchone()
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("Cache read failed: %s", e)
+        return None
+    if row is None:
+        return None
+    _MEM_CACHE[key] = json.loads(row[0])
+    return copy.deepcopy(_MEM_CACHE[key])
+
+
+def _cache_put(key: str, result: dict) -> None:
+    _MEM_CACHE[key] = copy.deepcopy(result)
+    try:
+        with contextlib.closing(_disk_connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO analyses (hash, json) VALUES (?, ?)",
+                         (key, json.dumps(result)))
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("Cache write failed: %s", e)
+
+
+def _cache_clear() -> None:
+    """Drop all cached analyses from memory and disk."""
+    _MEM_CACHE.clear()
+    if _DISK.exists():
+        _DISK.unlink()
+
+
+def analyze_resume(resume_text: str) -> dict:
+    """
+    Analyze resume and extract information for job matching.
+    
+    Results are cached by resume content, so re-analyzing the same
+    resume skips the API call.
+    
+    Returns:
+        dict: Job-matching relevant data or None if extraction fails
+    """
+    return analyze_resume_with_usage(resume_text)[0]
+
+
+def analyze_resume_with_usage(resume_text: str) -> tuple:
+    """
+    Like analyze_resume, but also return the Groq token usage of this call.
+    
+    Returns:
+        tuple: (result or None, token usage dict; empty when no API call was made)
+    """
+    if not _has_resume_text(resume_text):
+        logger.error("No resume text to analyze")
+        return None, {}
+    
+    return _analyze_prepared(_prepare_resume_text(resume_text))
+
+
+def _analyze_prepared(prepared_text: str) -> tuple:
+    """Cached analysis of text already passed through _prepare_resume_text."""
+    key = _cache_key(prepared_text)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.debug("Using cached resume analysis")
+        return cached, {}
+    
+    result, usage = _analyze_resume_uncached(prepared_text)
+    if result is not None:
+        _cache_put(key, result)
+    return result, usage
+
+
+analyze_resume.cache_clear = _cache_clear
+
+
+def analyze_resumes_batch(resume_texts: List[str]) -> tuple:
+    """
+    Analyze several resumes with a single Groq request.
+    
+    Cached resumes are served from the cache; the rest go out together in
+    one chat completion that shares SYSTEM_PROMPT with single analyses. If
+    the batched reply can't be parsed, each resume is analyzed on its own.
+    
+    Returns:
+        tuple: (one result per resume, in input order (None where extraction
+            failed), token usage summed over every API call made)
+    """
+    usage = {}
+    results = [None] * len(resume_texts)
+    # Each resume is compressed/truncated once, for both its cache key and the request
+    prepared = [_prepare_resume_text(text) if _has_resume_text(text) else None
+                for text in resume_texts]
+    keys = [_cache_key(text) if text is not None else None for text in prepared]
+    pending = []
+    for i, key in enumerate(keys):
+        if key is None:
+            logger.error("No text to analyze for resume %d", i + 1)
+            continue
+        results[i] = _cache_get(key)
+        if results[i] is None:
+            pending.append(i)
+    
+    # Nothing to batch
+    if len(pending) <= 1:
+        for i in pending:
+            results[i], call_usage = _analyze_prepared(prepared[i])
+            _add_usage(usage, call_usage)
+        return results, usage
+    
+    sections = [
+        f"---RESUME {n}---\n{prepared[i]}"
+        for n, i in enumerate(pending, 1)
+    ]
+    user_prompt = (
+        f"{BATCH_OUTPUT_INSTRUCTION}\n{len(pending)} resumes follow.\n\n" + "\n\n".join(sections)
+    )
+    
+    parsed = None
+    try:
+        logger.debug("Analyzing %d resumes in one batch with Llama AI...", len(pending))
+        response = client.chat.completions.create(
+            model=MODEL,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.3,
+            max_tokens=min(1500 * len(pending), 8000)
+        )
+        _add_usage(usage, _usage_from(response))
+        parsed = json.loads(_strip_code_fences(response.choices[0].message.content))
+    except Exception as e:
+        logger.warning("Batch analysis failed, analyzing individually: %s", e)
+    
+    if (not isinstance(parsed, list) or len(parsed) != len(pending)
+            or not all(isinstance(item, dict) for item in parsed)):
+        if parsed is not None:
+            logger.warning("Batch reply did not match the %d resumes sent, analyzing individually",
+                           len(pending))
+        for i in pending:
+            results[i], call_usage = _analyze_prepared(prepared[i])
+            _add_usage(usage, call_usage)
+        return results, usage
+    
+    for i, item in zip(pending, parsed):
+        try:
+            results[i] = _validate_result(item)
+        except (TypeError, ValueError) as e:
+            logger.warning("Invalid batch result, analyzing individually: %s", e)
+            results[i], call_usage = _analyze_resume_uncached(prepared[i])
+            _add_usage(usage, call_usage)
+        if results[i] is not None:
+            _cache_put(keys[i], results[i])
+    return results, usage
+
+
+def _analyze_resume_uncached(resume_text: str) -> tuple:
+    """
+    Run the Groq analysis pipeline without caching; returns (result, usage).
+    
+    `resume_text` must already be compressed/truncated by _prepare_resume_text.
+    """
+
+    # ============================================
+    # STEP 2: Build Prompt (step 1, compression, is done by the caller)
+    # ============================================
+    # Only the resume varies per call; everything before it is a fixed prompt prefix
+    user_prompt = f"{SINGLE_OUTPUT_INSTRUCTION}\n\nRESUME TEXT:\n{resume_text}"
+
     # ============================================
     # STEP 3: Call Gemini API
     # ============================================
@@ -93,7 +310,7 @@ Return ONLY the JSON object. Start with {{ and end with }}.
     #     print("\n🤖 Analyzing with Gemini AI...")
         
     #     # Combine prompts (Gemini doesn't have separate system role)
-    #     full_prompt = system_message + "\n\n" + user_prompt
+    #     full_prompt = SYSTEM_PROMPT + "\n\n" + user_prompt
         
     #     # Initialize model
     #     model = genai.GenerativeModel('gemini-2.5-flash')
@@ -115,44 +332,83 @@ Return ONLY the JSON object. Start with {{ and end with }}.
     #     return None
     
     try:
-        print("\n🤖 Analyzing with Llama AI...")
+        logger.debug("Analyzing with Llama AI...")
         response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[{"role": "user", "content": user_prompt}],
+            model=MODEL,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ],
             temperature=0.3,
             max_tokens=1500
         )
         content = response.choices[0].message.content
+        usage = _usage_from(response)
     except Exception as e:
-        print(f"API Error: {e}")
-        return None
+        logger.error("API Error: %s", e)
+        return None, {}
 
     # ============================================
     # STEP 4: Clean Response
     # ============================================
-    if '```json' in content:
-        content = content.split('```json')[1].split('```')[0]
-    elif '```' in content:
-        content = content.split('```')[1].split('```')[0]
-    
-    content = content.strip()
+    content = _strip_code_fences(content)
     
     # ============================================
     # STEP 5: Parse JSON
     # ============================================
     try:
         result = json.loads(content)
-        print("JSON parsed successfully!")
+        logger.debug("JSON parsed successfully")
         
     except json.JSONDecodeError as e:
-        print(f"JSON Error: {str(e)}")
-        print(f"Response was: {content[:300]}...")
-        return None  # ← Fixed: return None
+        logger.error("JSON Error: %s", e)
+        logger.debug("Response was: %s...", content[:300])
+        return None, usage  # ← Fixed: return None
     
     # ============================================
-    # STEP 6: Validate and Fix Data
+    # STEP 6-7: Validate and Fix Data
     # ============================================
+    return _validate_result(result), usage
+
+
+def _prepare_resume_text(resume_text: str) -> str:
+    """Shrink resume text to what is worth sending to the model."""
+    logger.debug("Original resume: %d chars", len(resume_text))
     
+    # Keep only the most job-relevant sentences to cut prompt tokens
+    resume_text = compress_resume(resume_text)
+    logger.debug("After compression: %d chars", len(resume_text))
+    
+    # Truncation stays as a fallback if compression still leaves too much
+    max_char = 4000
+    
+    if len(resume_text) <= max_char:
+        prepared_text = resume_text
+    else:
+        truncated = resume_text[:max_char]
+        last_spaced_index = truncated.rfind(' ')
+        if last_spaced_index > 0:
+            prepared_text = truncated[:last_spaced_index]
+        else:
+            prepared_text = truncated
+        logger.debug("Truncated from %d to %d chars", len(resume_text), len(prepared_text))
+    
+    logger.debug("After truncation: %d chars", len(prepared_text))
+    return prepared_text
+
+
+def _strip_code_fences(content: str) -> str:
+    """Remove markdown code fences the model sometimes wraps JSON in."""
+    if '```json' in content:
+        content = content.split('```json')[1].split('```')[0]
+    elif '```' in content:
+        content = content.split('```')[1].split('```')[0]
+    
+    return content.strip()
+
+
+def _validate_result(result: dict) -> dict:
+    """Normalize experience years and fill defaults for missing fields."""
     # Ensure experience_years is float
     if 'experience_years' in result:
         result['experience_years'] = float(result['experience_years'])
@@ -163,14 +419,12 @@ Return ONLY the JSON object. Start with {{ and end with }}.
         if num_roles > 0:
             estimated_years = round(num_roles * 1.5, 1)
             result['experience_years'] = estimated_years
-            print(f"AI returned 0 years but found {num_roles} roles")
-            print(f"   → Estimated {estimated_years} years")
+            logger.debug("AI returned 0 years but found %d roles, estimated %s years",
+                         num_roles, estimated_years)
     
-    print(f"Experience: {result.get('experience_years', 0)} years")
+    logger.debug("Experience: %s years", result.get('experience_years', 0))
     
-    # ============================================
-    # STEP 7: Validate Required Fields
-    # ============================================
+    # Add defaults for missing required fields
     required_fields = [
         'skills', 'experience_years', 'past_roles', 'current_role',
         'domain', 'projects', 'education_level', 'technologies',
@@ -179,7 +433,7 @@ Return ONLY the JSON object. Start with {{ and end with }}.
     
     for field in required_fields:
         if field not in result:
-            print(f"Warning: Missing field '{field}'")
+            logger.warning("Missing field '%s'", field)
             
             # Add default based on type
             if field in ['skills', 'past_roles', 'projects', 'technologies', 
@@ -190,4 +444,4 @@ Return ONLY the JSON object. Start with {{ and end with }}.
             else:
                 result[field] = "Not specified"
     
-    return result
\ No newline at end of file
+    return result
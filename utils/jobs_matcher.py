@@ -1,31 +1,169 @@
+import os
+import contextlib
+import logging
+import pickle
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Union
 from utils.groq_analyzer import analyze_resume
 from utils.pdf_handler import extract_text_from_pdf
 import re
+from collections import Counter
+import ahocorasick
+import pyarrow
+import pyarrow.parquet as pq
+from joblib import Parallel, delayed, effective_n_jobs
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+logger = logging.getLogger(__name__)
+
+# Jobs CSV structure; any other (e.g. trailing unnamed) columns are not loaded
+JOB_COLUMN_DTYPES = {
+    'company': 'string',
+    'category': 'string',
+    'post_link': 'string',
+    'job_description': 'string',
+    'location': 'string',
+    'date_posted': 'string',
+    'keywords': 'string'
+}
+
+TFIDF_CACHE_PATH = os.path.join(".cache", "tfidf.pkl")
+
+# Unigram TF-IDF settings. The token pattern keeps skills the default one
+# drops: single letters ("r"), trailing +/# ("c++", "c#") and dotted names ("node.js")
+TFIDF_PARAMS = {
+    'token_pattern': r"(?u)\b\w[\w+#]*(?:\.\w+)*",
+    'min_df': 2,
+    'sublinear_tf': True,
+    'dtype': np.float32
+}
+
+# TF-IDF cosines are small (rarely above 0.3), so they are mapped to a 0-1
+# skill score with 1 - exp(-cosine / TFIDF_COSINE_SCALE). The fixed scale keeps
+# skill scores on the same absolute footing as the experience and title scores;
+# it was fitted to the fraction of resume skills found in each shipped job.
+TFIDF_COSINE_SCALE = 0.07
+
+# Smaller job sets are scanned in-process: worker start-up would outweigh the scan
+PARALLEL_MIN_ROWS = 5000
+
+
+def _load_jobs(jobs_csv_path: str) -> pd.DataFrame:
+    """
+    Load the jobs CSV, reusing a Parquet sidecar when it is up to date.
+    
+    The sidecar (`<csv>.parquet`) is written on the first load and read
+    instead of the CSV until the CSV is modified again or the loaded
+    columns change.
+    """
+    parquet_path = jobs_csv_path + '.parquet'
+    if _sidecar_is_fresh(parquet_path, jobs_csv_path):
+        return pd.read_parquet(parquet_path, engine='pyarrow')
+    
+    # Only parse the columns the matcher uses, with fixed dtypes to skip inference
+    jobs_df = pd.read_csv(jobs_csv_path, usecols=list(JOB_COLUMN_DTYPES),
+                          dtype=JOB_COLUMN_DTYPES, engine='pyarrow')
+    
+    # Write next to the sidecar and swap it in, so readers never see a partial file
+    tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+    try:
+        jobs_df.to_parquet(tmp_path, engine='pyarrow', index=False)
+        os.replace(tmp_path, parquet_path)
+    except OSError as e:
+        logger.warning("Could not write Parquet cache: %s", e)
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+    
+    return jobs_df
+
+
+def _sidecar_is_fresh(parquet_path: str, jobs_csv_path: str) -> bool:
+    """True if the sidecar is newer than the CSV and holds exactly the loaded columns."""
+    if (not os.path.exists(parquet_path)
+            or os.path.getmtime(parquet_path) < os.path.getmtime(jobs_csv_path)):
+        return False
+    try:
+        columns = pq.read_schema(parquet_path).names
+    except (OSError, pyarrow.ArrowInvalid) as e:
+        logger.warning("Ignoring unreadable Parquet cache: %s", e)
+        return False
+    return columns == list(JOB_COLUMN_DTYPES)
+
+
+def _score_chunk(texts: List[str], skill_weights: Dict[str, int]) -> np.ndarray:
+    """
+    Count weighted skill matches in a chunk of lowercased job texts.
+    
+    Kept at module level and free of DataFrames so joblib workers can run it.
+    Uses a single Aho-Corasick automaton over all skills so each text is
+    scanned once.
+    
+    Args:
+        texts: Lowercased job texts
+        skill_weights: Lowercased skill -> number of times the resume lists it
+    """
+    # '' matches every job
+    weights = dict(skill_weights)
+    always_matched = float(weights.pop('', 0))
+    skill_hits = np.full(len(texts), always_matched)
+    if not weights:
+        return skill_hits
+    
+    automaton = ahocorasick.Automaton()
+    for i, (skill, weight) in enumerate(weights.items()):
+        automaton.add_word(skill, (i, weight))
+    automaton.make_automaton()
+    
+    def matched_weight(text: str) -> int:
+        matched = {value for _, value in automaton.iter(text)}
+        return sum(weight for _, weight in matched)
+    
+    return skill_hits + np.fromiter((matched_weight(text) for text in texts),
+                                    dtype=float, count=len(texts))
+
 
 class JobMatcher:
     """
     Match resume data with job postings and calculate relevance scores.
     """
-    def __init__(self, jobs_csv_path: str):
+    # Experience level indicators, checked in priority order (first hit wins)
+    _LEVEL_PATTERNS = [
+        ('Internship', re.compile(r'\b(?:intern|interns|internship)\b')),
+        ('Entry level', re.compile(r'\b(?:entry level|junior|graduate|associate)\b')),
+        ('Mid-Senior level', re.compile(r'\b(?:senior|lead|principal)\b|\bsr\.')),
+        ('Director', re.compile(r'\b(?:director|head of|vp|vice president)\b')),
+        ('Executive', re.compile(r'\b(?:chief|cto|ceo|executive)\b')),
+    ]
+    _DEFAULT_LEVEL = 'Mid-Senior level'
+
+    def __init__(self, jobs_csv_path: Union[str, pd.DataFrame], n_jobs: int = -1):
         """
         Initialize matcher with jobs dataset.
         
         Args:
-            jobs_csv_path: Path to filtered jobs CSV
+            jobs_csv_path: Path to filtered jobs CSV, or an already-loaded jobs DataFrame
+            n_jobs: Worker processes for the substring skill scan of job sets
+                with at least PARALLEL_MIN_ROWS jobs (joblib convention: -1 = all cores)
         """
-        # Load CSV and drop unnamed columns
-        self.jobs_df = pd.read_csv(jobs_csv_path)
+        self.n_jobs = n_jobs
+        if isinstance(jobs_csv_path, pd.DataFrame):
+            self.jobs_df = jobs_csv_path
+            source_path = None
+        else:
+            self.jobs_df = _load_jobs(jobs_csv_path)
+            source_path = jobs_csv_path
         
-        # Drop all 'Unnamed' columns
-        unnamed_cols = [col for col in self.jobs_df.columns if col.startswith('Unnamed')]
-        if unnamed_cols:
-            self.jobs_df = self.jobs_df.drop(columns=unnamed_cols)
-            print(f"Dropped {len(unnamed_cols)} unnamed columns")
+        # Fill missing text once so the scoring code can assume plain strings
+        text_cols = ['job_description', 'category', 'location', 'company', 'keywords', 'post_link']
+        self.jobs_df = self.jobs_df.assign(**{
+            col: self.jobs_df[col].fillna('').astype(str)
+            for col in text_cols if col in self.jobs_df.columns
+        })
         
-        print(f"Loaded {len(self.jobs_df)} jobs")
-        print(f"Columns: {list(self.jobs_df.columns)}")
+        logger.debug("Loaded %d jobs", len(self.jobs_df))
+        logger.debug("Columns: %s", list(self.jobs_df.columns))
         
         # Your CSV structure: company, category, post_link, job_description, location, date_posted, keywords
         self.col_names = {
@@ -36,15 +174,39 @@ class JobMatcher:
             'Experience_Level': None  # Not available
         }
 
+        # Lowercased search text per job, built once so scoring is vectorized
+        self._combined_lower = (
+            self.jobs_df['job_description'] + ' ' +
+            self.jobs_df['category'] + ' ' +
+            self.jobs_df['keywords']
+        ).str.lower()
+        
+        # Display title and experience level only depend on the job, so resolve them once
+        self._titles = self._resolve_titles().astype('category')
+        self._levels = pd.Categorical(self._estimate_experience_levels())
+        
+        # (vocab, jobs x vocab matrix) for the substring skill fallback; built
+        # on first use since TF-IDF scoring usually makes it unnecessary
+        self._skill_index = None
+        
+        # TF-IDF model of the job texts for cosine skill scoring (None if unavailable)
+        self._vectorizer, self._tfidf = self._build_tfidf(source_path)
+        
+        # Low-cardinality text columns as categoricals: int codes instead of one str per row.
+        # Done last since the derived columns above fill and combine them as plain strings.
+        for col in ['company', 'category', 'location', 'date_posted']:
+            if col in self.jobs_df.columns:
+                self.jobs_df[col] = self.jobs_df[col].astype('category')
+
     def extract_title_from_description(self, description: str) -> str:
         """
         Extract job title from description if category is missing.
         """
-        if pd.isna(description):
+        if not description:
             return "Unknown Position"
         
         # Try to find title in first 200 chars
-        first_part = str(description)[:200]
+        first_part = description[:200]
         
         # Common patterns: "Position: Title" or "Title - Company" or just first line
         lines = first_part.split('\n')
@@ -53,60 +215,26 @@ class JobMatcher:
         
         return "Unknown Position"
 
-    def calculate_skill_match(self, resume_skills: List[str], 
-                            job_description: str,
-                            job_title: str,
-                            job_keywords: str = None) -> float:
-        """Calculate skill match score using keywords and description."""
-        
-        if not resume_skills:
-            return 0.0
-        
-        # Combine ALL text sources (keywords are most important!)
-        text_parts = [str(job_description), str(job_title)]
-        if job_keywords and not pd.isna(job_keywords):
-            text_parts.append(str(job_keywords))
-        
-        combined_text = " ".join(text_parts).lower()
-        
-        # Count matching skills
-        matched_count = sum(1 for skill in resume_skills if skill.lower() in combined_text)
-        
-        score = matched_count / len(resume_skills) if resume_skills else 0.0
-        
-        return score
-
     def estimate_experience_level(self, job_description: str, job_title: str) -> str:
         """
         Estimate experience level from job description and title.
         """
-        if pd.isna(job_description):
-            job_description = ""
-        if pd.isna(job_title):
-            job_title = ""
-        
-        combined = (str(job_description) + " " + str(job_title)).lower()
+        combined = (job_description + " " + job_title).lower()
         
         # Check for level indicators
-        if any(word in combined for word in ['intern', 'internship']):
-            return 'Internship'
-        elif any(word in combined for word in ['entry level', 'junior', 'graduate', 'associate']):
-            return 'Entry level'
-        elif any(word in combined for word in ['senior', 'sr.', 'lead', 'principal']):
-            return 'Mid-Senior level'
-        elif any(word in combined for word in ['director', 'head of', 'vp', 'vice president']):
-            return 'Director'
-        elif any(word in combined for word in ['chief', 'cto', 'ceo', 'executive']):
-            return 'Executive'
-        else:
-            return 'Mid-Senior level'  # Default
+        for level, pattern in self._LEVEL_PATTERNS:
+            if pattern.search(combined):
+                return level
+        return self._DEFAULT_LEVEL
 
-    def calculate_experience_match(self, resume_years: float, job_level: str) -> float:
-        """Calculate experience level match."""
-        
-        if pd.isna(job_level) or job_level == '':
-            return 0.5  # Neutral score
+    def calculate_experience_match(self, resume_years: Union[float, np.ndarray],
+                                   job_level: Union[str, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Calculate experience level match.
         
+        Works on scalars or arrays (broadcast against each other) without
+        per-element branching; returns a float for scalar inputs.
+        """
         # Map levels to year ranges
         level_ranges = {
             'Internship': (0, 1),
@@ -117,43 +245,39 @@ class JobMatcher:
             'Executive': (15, 30)
         }
         
-        if job_level not in level_ranges:
-            return 0.5
-        
-        min_years, max_years = level_ranges[job_level]
-        
-        if min_years <= resume_years <= max_years:
-            return 1.0
-        elif resume_years < min_years:
-            gap = min_years - resume_years
-            if gap <= 0.5:
-                return 0.95
-            elif gap <= 1.0:
-                return 0.85
-            elif gap <= 1.5:
-                return 0.70
-            elif gap <= 2.0:
-                return 0.55
-            else:
-                return 0.30
-        else:
-            gap = resume_years - max_years
-            if gap <= 1.0:
-                return 0.90
-            elif gap <= 2.0:
-                return 0.75
-            elif gap <= 3.0:
-                return 0.60
-            else:
-                return 0.40
+        # Unknown or empty levels get NaN bounds and a neutral score
+        level_idx = pd.Index(list(level_ranges)).get_indexer(np.atleast_1d(job_level).ravel())
+        bounds = np.array(list(level_ranges.values()) + [(np.nan, np.nan)], dtype=float)
+        min_years = bounds[level_idx, 0].reshape(np.shape(job_level))
+        max_years = bounds[level_idx, 1].reshape(np.shape(job_level))
+        
+        resume_years = np.asarray(resume_years, dtype=float)
+        under_gap = min_years - resume_years
+        over_gap = resume_years - max_years
+        under = under_gap > 0
+        # Not ~under & ~over: NaN years would count as in range
+        in_range = (resume_years >= min_years) & (resume_years <= max_years)
+        
+        score = np.select(
+            [np.isnan(min_years), in_range,
+             under & (under_gap <= 0.5), under & (under_gap <= 1.0),
+             under & (under_gap <= 1.5), under & (under_gap <= 2.0), under,
+             over_gap <= 1.0, over_gap <= 2.0, over_gap <= 3.0],
+            [0.5, 1.0,
+             0.95, 0.85,
+             0.70, 0.55, 0.30,
+             0.90, 0.75, 0.60],
+            default=0.40
+        )
+        return float(score) if score.ndim == 0 else score
     
     def calculate_title_match(self, job_title: str, resume_desired_roles: List[str]) -> float:
         """Check if job title matches desired roles."""
         
-        if not resume_desired_roles or pd.isna(job_title):
+        if not resume_desired_roles or not job_title:
             return 0.5
         
-        job_title = str(job_title).lower()
+        job_title = job_title.lower()
         
         for desired in resume_desired_roles:
             desired_words = set(desired.lower().split())
@@ -168,108 +292,281 @@ class JobMatcher:
         return 0.3
     
     def calculate_overall_score(self, resume_data: Dict, job_row: pd.Series) -> Dict:
-        """Calculate overall match score."""
-        
-        job_title = job_row.get('category')
-        job_description = job_row.get('job_description')
+        """
+        Calculate overall match score for one row of `jobs_df`.
         
-        # If category is empty, try to extract title from description
-        if pd.isna(job_title) or job_title == '':
-            job_title = self.extract_title_from_description(job_description)
+        Uses the same vectorized scoring as finding_matching_jobs (scoring
+        every job), so prefer that when ranking many jobs.
+        """
+        pos = self.jobs_df.index.get_loc(job_row.name)
+        skill_score, exp_score, title_score = self._score_components(resume_data)
         
-        # Estimate experience level from text
-        estimated_level = self.estimate_experience_level(job_description, job_title)
+        return {
+            'overall': float(self._combine_scores(skill_score, exp_score, title_score)[pos]),
+            'skill_score': float(skill_score[pos]),
+            'exp_score': float(exp_score[pos]),
+            'title_score': float(title_score[pos]),
+            'estimated_level': self._levels[pos],
+            'resolved_title': self._titles.iloc[pos]
+        }
+    
+    @staticmethod
+    def _combine_scores(skill_score, exp_score, title_score):
+        """Weighted sum of the component scores."""
+        return 0.50 * skill_score + 0.30 * exp_score + 0.20 * title_score
+
+    def _resolve_titles(self) -> pd.Series:
+        """Category as title, falling back to the first line of the description."""
+        category = self.jobs_df['category']
+        description = self.jobs_df['job_description']
+        fallback = description.str[:200]
+        fallback = fallback.str.split('\n', n=1).str[0].str.strip().str[:100]
+        fallback = fallback.where(description != '', "Unknown Position")
+        return category.where(category != '', fallback)
+
+    def _estimate_experience_levels(self) -> np.ndarray:
+        """Estimate each job's experience level from its combined text (first pattern hit wins)."""
+        # Pattern strings (not compiled objects) let pandas use pyarrow's
+        # regex kernel when the column is arrow-backed
+        conditions = [
+            self._combined_lower.str.contains(pattern.pattern, regex=True).to_numpy(dtype=bool)
+            for _, pattern in self._LEVEL_PATTERNS
+        ]
+        choices = [level for level, _ in self._LEVEL_PATTERNS]
+        return np.select(conditions, choices, default=self._DEFAULT_LEVEL)
+
+    def _build_skill_matrix(self, min_jobs: int = 5):
+        """
+        Precompute which common skills appear in which jobs.
         
-        skill_score = self.calculate_skill_match(
-            resume_data['skills'],
-            job_description,
-            job_title
+        The vocabulary is every comma-separated keyword listed by at least
+        `min_jobs` jobs. Returns (vocab -> column index, sparse jobs x vocab
+        0/1 matrix), or (None, None) when no keyword is that common.
+        """
+        job_freq = Counter()
+        for keywords in self.jobs_df['keywords']:
+            job_freq.update({kw.strip().lower() for kw in keywords.split(',') if kw.strip()})
+        vocab = sorted(kw for kw, count in job_freq.items() if count >= min_jobs)
+        if not vocab:
+            return None, None
+        
+        automaton = ahocorasick.Automaton()
+        for col, term in enumerate(vocab):
+            automaton.add_word(term, col)
+        automaton.make_automaton()
+        
+        # One pass over each job text finds every vocabulary term it contains
+        indptr = [0]
+        indices = []
+        for text in self._combined_lower:
+            indices.extend({col for _, col in automaton.iter(text)})
+            indptr.append(len(indices))
+        
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, indptr),
+            shape=(len(self._combined_lower), len(vocab))
         )
+        return {term: col for col, term in enumerate(vocab)}, matrix
+
+    def _build_tfidf(self, source_path: str = None):
+        """
+        Fit a TF-IDF model over the job texts, reusing the on-disk cache.
         
-        exp_score = self.calculate_experience_match(
-            resume_data['experience_years'],
-            estimated_level
-        )
+        The cache is only used when the jobs came from a CSV path and is
+        refitted whenever that file or TFIDF_PARAMS change. Returns
+        (vectorizer, L2-normalized jobs matrix), or (None, None) when the
+        corpus is too small to fit.
+        """
+        signature = None
+        if source_path is not None:
+            signature = (os.path.abspath(source_path), os.path.getmtime(source_path),
+                         len(self.jobs_df), TFIDF_PARAMS)
+            if os.path.exists(TFIDF_CACHE_PATH):
+                try:
+                    with open(TFIDF_CACHE_PATH, 'rb') as f:
+                        cached = pickle.load(f)
+                    if cached.get('signature') == signature:
+                        return cached['vectorizer'], cached['matrix']
+                except Exception as e:
+                    logger.warning("Ignoring unreadable TF-IDF cache: %s", e)
+        
+        vectorizer = TfidfVectorizer(**TFIDF_PARAMS)
+        try:
+            matrix = vectorizer.fit_transform(self._combined_lower)
+        except ValueError as e:
+            # Too few jobs/terms for min_df (e.g. a tiny DataFrame)
+            logger.warning("Skipping TF-IDF model: %s", e)
+            return None, None
+        vectorizer.stop_words_ = None  # Only kept for introspection; bloats the cache
+        
+        if signature is not None:
+            # Write next to the cache and swap it in, so readers never see a partial file
+            tmp_path = f"{TFIDF_CACHE_PATH}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(TFIDF_CACHE_PATH), exist_ok=True)
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump({'signature': signature, 'vectorizer': vectorizer, 'matrix': matrix},
+                                f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, TFIDF_CACHE_PATH)
+            except OSError as e:
+                logger.warning("Could not write TF-IDF cache: %s", e)
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_path)
+        
+        return vectorizer, matrix
+
+    def _tfidf_skill_scores(self, resume_data: Dict):
+        """
+        Cosine similarity of each job to the resume's skills, technologies and roles.
         
-        title_score = self.calculate_title_match(
-            job_title,
-            resume_data.get('desired_roles', [])
-        )
+        Calibrated to 0-1 with TFIDF_COSINE_SCALE. Returns None when no TF-IDF model is available or the resume shares
+        no terms with it.
+        """
+        if self._vectorizer is None:
+            return None
+        
+        terms = (list(resume_data.get('skills', [])) +
+                 list(resume_data.get('technologies', [])) +
+                 list(resume_data.get('past_roles', [])))
+        query = self._vectorizer.transform([' '.join(terms)])
+        if query.nnz == 0:
+            return None
+        
+        # Both sides are L2-normalized, so the dot product is the cosine
+        sims = (self._tfidf @ query.T).toarray().ravel().astype(float)
+        return 1.0 - np.exp(-sims / TFIDF_COSINE_SCALE)
 
-        weights = {
-            'skills': 0.50,
-            'experience': 0.30,
-            'title': 0.20
-        }
+    def _count_skill_hits(self, resume_skills: List[str]) -> np.ndarray:
+        """
+        Count how many resume skills appear in each job's combined text.
         
-        overall = (
-            skill_score * weights['skills'] +
-            exp_score * weights['experience'] +
-            title_score * weights['title']
-        )
+        Skills in the common-keyword vocabulary are counted with one sparse
+        matrix-vector product; the rest are scanned for in the job texts.
+        """
+        if self._skill_index is None:
+            self._skill_index = self._build_skill_matrix()
+        skill_vocab, skill_matrix = self._skill_index
+        
+        skills_lower = [skill.lower() for skill in resume_skills]
+        if skill_matrix is None:
+            return self._scan_skill_hits(skills_lower)
+        
+        query = np.zeros(len(skill_vocab), dtype=np.float32)
+        unknown_skills = []
+        for skill in skills_lower:
+            col = skill_vocab.get(skill)
+            if col is None:
+                unknown_skills.append(skill)
+            else:
+                query[col] += 1
         
-        return {
-            'overall': overall,
-            'skill_score': skill_score,
-            'exp_score': exp_score,
-            'title_score': title_score,
-            'estimated_level': estimated_level
-        }
-    
+        skill_hits = skill_matrix @ query
+        if unknown_skills:
+            skill_hits = skill_hits + self._scan_skill_hits(unknown_skills)
+        return skill_hits.astype(float)
+
+    def _scan_skill_hits(self, skills_lower: List[str]) -> np.ndarray:
+        """
+        Count matches of lowercased skills by scanning each job's text.
+        
+        Job sets of at least PARALLEL_MIN_ROWS jobs are split into one chunk
+        per worker (n_jobs) and scanned in parallel processes.
+        """
+        # Duplicate skills count once per listing
+        skill_weights = Counter(skills_lower)
+        texts = self._combined_lower.tolist()
+        
+        n_chunks = effective_n_jobs(self.n_jobs)
+        if n_chunks <= 1 or len(texts) < PARALLEL_MIN_ROWS:
+            return _score_chunk(texts, skill_weights)
+        
+        bounds = np.linspace(0, len(texts), n_chunks + 1, dtype=int)
+        chunk_hits = Parallel(n_jobs=n_chunks, backend='loky')(
+            delayed(_score_chunk)(texts[start:end], skill_weights)
+            for start, end in zip(bounds[:-1], bounds[1:])
+        )
+        return np.concatenate(chunk_hits)
+
+    def _score_components(self, resume_data: Dict):
+        """Skill, experience and title scores of every job, as arrays."""
+        n = len(self.jobs_df)
+        resume_skills = resume_data.get('skills', [])
+        
+        # Skills: TF-IDF cosine similarity, falling back to counting resume
+        # skills found in each job's combined text
+        skill_score = self._tfidf_skill_scores(resume_data)
+        if skill_score is None:
+            skill_hits = self._count_skill_hits(resume_skills)
+            skill_score = skill_hits / len(resume_skills) if resume_skills else np.zeros(n)
+        
+        # Experience: resume years are fixed, so score each distinct level once
+        # and broadcast through the categorical codes
+        levels = self._levels
+        level_scores = self.calculate_experience_match(resume_data['experience_years'],
+                                                       levels.categories.to_numpy())
+        exp_score = level_scores[levels.codes]
+        
+        # Title: score each distinct title once
+        titles = self._titles
+        desired_roles = resume_data.get('desired_roles', [])
+        title_scores = np.array([
+            self.calculate_title_match(title, desired_roles)
+            for title in titles.cat.categories
+        ])
+        title_score = title_scores[titles.cat.codes.to_numpy()]
+        
+        return skill_score, exp_score, title_score
+
     def finding_matching_jobs(self, resume_data: Dict, top_n: int = 10, min_score: float = 0.3) -> pd.DataFrame:
         """Find top matching jobs."""
         
         experience_years = resume_data.get('experience_years', 0)
         career_level = resume_data.get('career_level', '')
+        resume_skills = resume_data.get('skills', [])
         
-        print(f"\n Searching {len(self.jobs_df):,} jobs...")
-        print(f" Resume profile:")
-        print(f"   - Experience: {experience_years} years")
-        print(f"   - Level: {career_level}")
-        print(f"   - Skills: {len(resume_data.get('skills', []))} skills")
+        logger.debug("Searching %d jobs for resume: %s years, level %s, %d skills",
+                     len(self.jobs_df), experience_years, career_level, len(resume_skills))
         
-        results = []
+        n = len(self.jobs_df)
+        levels = self._levels
+        titles = self._titles
         
-        print(f"\n Calculating match scores...")
+        skill_score, exp_score, title_score = self._score_components(resume_data)
+        overall = self._combine_scores(skill_score, exp_score, title_score)
         
-        for idx, job in self.jobs_df.iterrows():
-            scores = self.calculate_overall_score(resume_data, job)
-            
-            # Debug first few jobs
-            if idx < 5:
-                print(f"\n   Job {idx+1}: {str(job.get('category', 'No title'))[:50]}")
-                print(f"   Overall: {scores['overall']:.1%} | Skills: {scores['skill_score']:.1%} | Exp: {scores['exp_score']:.1%} | Title: {scores['title_score']:.1%}")
-            
-            if scores['overall'] >= min_score:
-                job_title = job.get('category')
-                if pd.isna(job_title) or job_title == '':
-                    job_title = self.extract_title_from_description(job.get('job_description'))
-                
-                results.append({
-                    'title': job_title,
-                    'company': job.get('company'),
-                    'location': job.get('location'),
-                    'experience_level': scores['estimated_level'],
-                    'description': job.get('job_description'),
-                    'post_link': job.get('post_link'),
-                    'keywords': job.get('keywords'),
-                    'match_score': scores['overall'],
-                    'skill_score': scores['skill_score'],
-                    'exp_score': scores['exp_score'],
-                    'title_score': scores['title_score']
-                })
-
-        if len(results) == 0:
-            print(f"\n No jobs found above {min_score:.0%} threshold")
-            print("💡 Try lowering min_score to 0.1 or check if your resume has skills")
-            return pd.DataFrame()
+        # Debug first few jobs
+        if logger.isEnabledFor(logging.DEBUG):
+            for i in range(min(5, n)):
+                logger.debug("Job %d: %s | Overall: %.1f%% | Skills: %.1f%% | Exp: %.1f%% | Title: %.1f%%",
+                             i + 1, self.jobs_df['category'].iloc[i][:50], overall[i] * 100,
+                             skill_score[i] * 100, exp_score[i] * 100, title_score[i] * 100)
         
-        results_df = pd.DataFrame(results)
-        results_df = results_df.sort_values('match_score', ascending=False)
-        top_results = results_df
+        matching_idx = np.flatnonzero(overall >= min_score)
         
-        print(f"\n Found {len(results_df)} jobs above {min_score:.0%} threshold")
-        print(f" Returning top {len(top_results)} matches")
+        if len(matching_idx) == 0:
+            logger.info("No jobs found above %.0f%% threshold; try lowering min_score "
+                        "or check if the resume has skills", min_score * 100)
+            return pd.DataFrame()
+        
+        # Partial sort: find the top_n-th best score in O(n), then fully
+        # order only the jobs at or above it (ties broken by CSV order)
+        top_idx = matching_idx
+        if len(matching_idx) > top_n:
+            cutoff = -np.partition(-overall[matching_idx], top_n - 1)[top_n - 1]
+            top_idx = matching_idx[overall[matching_idx] >= cutoff]
+        top_idx = top_idx[np.lexsort((top_idx, -overall[top_idx]))][:top_n]
+        
+        top_results = self.jobs_df.iloc[top_idx][
+            ['company', 'location', 'job_description', 'post_link', 'keywords']
+        ].rename(columns={'job_description': 'description'}).reset_index(drop=True)
+        top_results.insert(0, 'title', titles.iloc[top_idx].to_numpy())
+        top_results.insert(3, 'experience_level', np.asarray(levels[top_idx]))
+        top_results['match_score'] = overall[top_idx]
+        top_results['skill_score'] = skill_score[top_idx]
+        top_results['exp_score'] = exp_score[top_idx]
+        top_results['title_score'] = title_score[top_idx]
+        
+        logger.debug("Found %d jobs above %.0f%% threshold, returning top %d",
+                     len(matching_idx), min_score * 100, len(top_results))
         
         return top_results
-
@@ -1,32 +1,41 @@
+import io
+from typing import BinaryIO, Union
+import pymupdf
 from pypdf import PdfReader
 
-def extract_text_from_pdf(pdf_file) -> str:
+# Prefix of the message returned instead of text when a PDF can't be read
+READ_ERROR_PREFIX = "Error reading file."
+
+def extract_text_from_pdf(pdf_file: Union[BinaryIO, bytes]) -> str:
     """
     Extract text from uploaded PDF file.
     Args:
-        pdf_file: Streamlit UploadedFile object
+        pdf_file: Streamlit UploadedFile object (or raw PDF bytes)
     Returns:
         str: Extracted text from all pages
-    TODO: 
-    - Create PdfReader object
-    - Loop through all pages
-    - Extract text from each page
-    - Combine all text with spaces
-    - Handle errors (what if PDF is corrupted?)
+    Uses PyMuPDF for speed, falling back to pypdf for files it can't parse.
     """
-    extracted = []
     try:
-        pdf_reader = PdfReader(pdf_file)
-        print(len(pdf_reader.pages))
-        print(pdf_reader.pages)
-        for page in pdf_reader.pages:
+        # getvalue() returns the whole upload regardless of its read position
+        if isinstance(pdf_file, (bytes, bytearray)):
+            raw = pdf_file
+        elif hasattr(pdf_file, 'getvalue'):
+            raw = pdf_file.getvalue()
+        else:
+            raw = pdf_file.read()
+        try:
+            with pymupdf.open(stream=raw, filetype="pdf") as doc:
+                text = "\n".join(page.get_text("text") for page in doc).strip()
+        except pymupdf.FileDataError:
+            extracted = []
+            pdf_reader = PdfReader(io.BytesIO(raw))
+            for page in pdf_reader.pages:
                 page_text = page.extract_text()
                 if page_text:
                     extracted.append(page_text)
-        return " ".join(extracted).strip()
+            text = " ".join(extracted).strip()
+        # Drop our reference so the PDF bytes can be freed before analysis
+        del raw
+        return text
     except Exception as e:
-        return f"Error reading file. An error occured: {e}"
-    
-
-
-
+        return f"{READ_ERROR_PREFIX} An error occured: {e}"
@@ -0,0 +1,89 @@
+import re
+
+# Common skill/technology keywords that mark a resume line as worth keeping
+SKILL_KEYWORDS = {
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'go', 'rust', 'sql',
+    'nosql', 'html', 'css', 'react', 'angular', 'vue', 'node', 'django', 'flask',
+    'fastapi', 'spring', 'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform',
+    'linux', 'git', 'ci/cd', 'jenkins', 'spark', 'hadoop', 'kafka', 'airflow',
+    'pandas', 'numpy', 'tensorflow', 'pytorch', 'scikit-learn', 'machine learning',
+    'deep learning', 'nlp', 'llm', 'data', 'analytics', 'tableau', 'power bi', 'excel',
+    'postgresql', 'mysql', 'mongodb', 'redis', 'graphql', 'rest', 'api', 'microservices',
+    'agile', 'scrum', 'jira', 'figma', 'salesforce', 'sap', 'leadership', 'management',
+    'engineer', 'developer', 'analyst', 'manager', 'intern', 'lead', 'architect',
+    'experience', 'skills', 'education', 'projects', 'bachelor', 'master', 'degree',
+}
+
+YEAR_PATTERN = re.compile(r'\b(?:19|20)\d{2}\b|\bpresent\b', re.IGNORECASE)
+WORD_PATTERN = re.compile(r'[A-Za-z][A-Za-z+#/.-]*')
+BULLET_CHARS = ('•', '-', '*', '–', '▪', '●', '◦')
+SKILL_PHRASES = {keyword for keyword in SKILL_KEYWORDS if ' ' in keyword}
+
+
+def _split_sentences(text: str) -> list:
+    """Split resume text into lines and sentences, dropping empty pieces."""
+    pieces = re.split(r'\n+|(?<=[.!?])\s+', text)
+    return [piece.strip() for piece in pieces if piece.strip()]
+
+
+def _score_sentence(sentence: str) -> float:
+    """Score how likely a sentence is to carry job-matching information."""
+    lowered = sentence.lower()
+    words = WORD_PATTERN.findall(sentence)
+    tokens = {word.lower().rstrip('.') for word in words}
+
+    score = 0.0
+    if YEAR_PATTERN.search(sentence):
+        score += 2.0
+    keyword_hits = len(tokens & SKILL_KEYWORDS) + sum(1 for phrase in SKILL_PHRASES if phrase in lowered)
+    score += min(3, keyword_hits)
+    if sentence.startswith(BULLET_CHARS):
+        score += 1.0
+    if words:
+        score += sum(1 for word in words if word[0].isupper()) / len(words)
+    return score
+
+
+def compress_resume(text: str, budget_chars: int = 2500) -> str:
+    """
+    Keep the most job-relevant sentences of a resume within a character budget.
+    
+    A sentence longer than the budget left is cut down to fit (at a word
+    boundary where possible) rather than dropped.
+
+    Args:
+        text: Raw resume text
+        budget_chars: Maximum length of the compressed text
+    Returns:
+        str: Highest scoring sentences, in their original order, or the
+            unchanged text if nothing could be kept
+    """
+    if len(text) <= budget_chars:
+        return text
+
+    sentences = _split_sentences(text)
+    ranked = sorted(range(len(sentences)), key=lambda i: _score_sentence(sentences[i]), reverse=True)
+
+    kept = {}
+    seen = set()
+    used = 0
+    for i in ranked:
+        # Skip repeats such as page headers/footers
+        if sentences[i] in seen:
+            continue
+        remaining = budget_chars - used - 1  # joining newline
+        if remaining <= 0:
+            break
+        sentence = sentences[i]
+        if len(sentence) > remaining:
+            sentence = sentence[:remaining]
+            last_space = sentence.rfind(' ')
+            if last_space > 0:
+                sentence = sentence[:last_space]
+        kept[i] = sentence
+        seen.add(sentences[i])
+        used += len(sentence) + 1
+
+    if not kept:
+        return text
+    return "\n".join(kept[i] for i in sorted(kept))